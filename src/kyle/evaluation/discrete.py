@@ -36,8 +36,9 @@ class EvalStats:
         self._top_class_confidences = confidences.max(axis=1)
 
         self.bins: int = None
-        # due to discretization they don't sum to 1 anymore
-        self._discretized_confidences: np.ndarray = None
+        # indices of the bins the confidences fall into, of shape (n_samples, n_classes)
+        self._binned_confidences: np.ndarray = None
+        self._binned_top_class_confidences: np.ndarray = None
         self._discretized_probab_values: np.ndarray = None
         self.set_bins(bins)
 
@@ -64,7 +65,32 @@ class EvalStats:
         binned_confidences = (
             np.digitize(x=self.confidences, bins=bin_boundaries, right=True) - 1
         )
-        self._discretized_confidences = (binned_confidences + 0.5) / self.bins
+        binned_top_class_confidences = binned_confidences.max(axis=1)
+        # confidences outside of [0, 1] (or nan) don't belong to any bin. They are collected in an
+        # additional overflow bin with index self.bins, which is dropped from all per-bin statistics
+        for bin_indices in (binned_confidences, binned_top_class_confidences):
+            bin_indices[(bin_indices < 0) | (bin_indices >= self.bins)] = self.bins
+        self._binned_confidences = binned_confidences
+        self._binned_top_class_confidences = binned_top_class_confidences
+
+    def _sums_per_bin(self, bin_indices: np.ndarray, weights: np.ndarray = None):
+        """
+        :param bin_indices: integer array of shape (n_samples,) or (n_samples, n_columns) with the bin index
+            of each entry, entries with the overflow index self.bins are ignored
+        :param weights: array of the same shape as bin_indices; if None, the members of each bin are counted
+        :return: array of shape (N_bins,) or (n_columns, N_bins) with the sum of weights in each bin
+        """
+        if bin_indices.ndim == 1:
+            sums = np.bincount(bin_indices, weights=weights, minlength=self.bins + 1)
+            return sums[: self.bins].astype(float)
+        return np.stack(
+            [
+                self._sums_per_bin(
+                    bin_indices[:, i], None if weights is None else weights[:, i]
+                )
+                for i in range(bin_indices.shape[1])
+            ]
+        )
 
     def accuracy(self):
         return safe_accuracy_score(self.y_true, self.y_pred)
@@ -144,10 +170,9 @@ class EvalStats:
         """
         errors = np.zeros(self.num_classes)
         weights = np.zeros(self.num_classes)
-        for class_label in range(self.num_classes):
-            accuracies, n_members, class_confidences = self.marginal_reliabilities(
-                class_label
-            )
+        for class_label, (accuracies, n_members, class_confidences) in enumerate(
+            zip(*self._marginal_reliabilities(np.arange(self.num_classes)))
+        ):
             total_members = np.sum(n_members)
             errors[class_label] = self._expected_error(
                 accuracies, n_members, class_confidences
@@ -157,7 +182,10 @@ class EvalStats:
 
     def class_wise_expected_calibration_error(self):
         result = sum(
-            self.expected_marginal_calibration_error(k) for k in range(self.num_classes)
+            self._expected_error(*class_reliabilities)
+            for class_reliabilities in zip(
+                *self._marginal_reliabilities(np.arange(self.num_classes))
+            )
         )
         result /= self.num_classes
         return result
@@ -169,28 +197,38 @@ class EvalStats:
 
         :return: tuple of two 1-dim arrays of length N, corresponding to (accuracy_per_bin, num_members_per_bin)
         """
-        discretized_class_confidences = self._discretized_confidences[:, class_label]
-        class_confidences = self.confidences[:, class_label]
-
-        members_per_bin = np.zeros(self.bins)
-        accuracies_per_bin = np.zeros(self.bins)
-        mean_class_confidences_per_bin = np.zeros(self.bins)
-        for i, probability_bin in enumerate(self._discretized_probab_values):
-            probability_bin_mask = discretized_class_confidences == probability_bin
-            cur_gt_labels = self.y_true[probability_bin_mask]
-            cur_class_confidences = class_confidences[probability_bin_mask]
-
-            cur_members = np.sum(probability_bin_mask)
-            cur_accuracy = safe_accuracy_score(
-                cur_gt_labels, class_label * np.ones(len(cur_gt_labels))
-            )
-            if len(cur_class_confidences) > 0:
-                cur_mean_class_confidence = cur_class_confidences.mean()
-            else:
-                cur_mean_class_confidence = probability_bin
-            members_per_bin[i] = cur_members
-            accuracies_per_bin[i] = cur_accuracy
-            mean_class_confidences_per_bin[i] = cur_mean_class_confidence
+        return tuple(
+            reliabilities[0]
+            for reliabilities in self._marginal_reliabilities(np.array([class_label]))
+        )
+
+    def _marginal_reliabilities(self, class_labels: np.ndarray):
+        """
+        Same as marginal_reliabilities but for several classes at once, returning the results stacked
+        along the first axis.
+
+        :param class_labels: integer array of shape (n_labels,)
+        :return: tuple of three arrays of shape (n_labels, N), corresponding to
+            (accuracy_per_bin, num_members_per_bin, mean_class_confidence_per_bin)
+        """
+        class_bins = self._binned_confidences[:, class_labels]
+        class_confidences = self.confidences[:, class_labels]
+
+        members_per_bin = self._sums_per_bin(class_bins)
+        non_empty_bins = members_per_bin > 0
+        accuracies_per_bin = np.divide(
+            self._sums_per_bin(class_bins, self.y_true[:, None] == class_labels),
+            members_per_bin,
+            out=np.zeros(members_per_bin.shape),
+            where=non_empty_bins,
+        )
+        # empty bins are assigned their center as mean confidence
+        mean_class_confidences_per_bin = np.divide(
+            self._sums_per_bin(class_bins, class_confidences),
+            members_per_bin,
+            out=np.tile(self._discretized_probab_values, (len(class_labels), 1)),
+            where=non_empty_bins,
+        )
         return accuracies_per_bin, members_per_bin, mean_class_confidences_per_bin
 
     def top_class_reliabilities(self):
@@ -199,30 +237,22 @@ class EvalStats:
 
         :return: tuple of two 1-dim arrays of length N, corresponding to (accuracy_per_bin, num_members_per_bin)
         """
-        members_per_bin = np.zeros(self.bins)
-        accuracies_per_bin = np.zeros(self.bins)
-        mean_confidences_per_bin = np.zeros(self.bins)
-        discretized_top_class_confidences = self._discretized_confidences.max(axis=1)
-        for i, probability in enumerate(self._discretized_probab_values):
-            probability_bin_mask = discretized_top_class_confidences == probability
-            cur_members = np.sum(probability_bin_mask)
-            if cur_members == 0:
-                members_per_bin[i] = 0
-                accuracies_per_bin[i] = 0
-                mean_confidences_per_bin[i] = 0
-                continue
-
-            cur_gt_labels = self.y_true[probability_bin_mask]
-            cur_pred_labels = self.y_pred[probability_bin_mask]
-            cur_top_class_confidences = self._top_class_confidences[
-                probability_bin_mask
-            ]
+        top_class_bins = self._binned_top_class_confidences
 
-            cur_accuracy = safe_accuracy_score(cur_gt_labels, cur_pred_labels)
-            cur_mean_confidence = cur_top_class_confidences.mean()
-            members_per_bin[i] = cur_members
-            accuracies_per_bin[i] = cur_accuracy
-            mean_confidences_per_bin[i] = cur_mean_confidence
+        members_per_bin = self._sums_per_bin(top_class_bins)
+        non_empty_bins = members_per_bin > 0
+        accuracies_per_bin = np.divide(
+            self._sums_per_bin(top_class_bins, self.y_true == self.y_pred),
+            members_per_bin,
+            out=np.zeros(self.bins),
+            where=non_empty_bins,
+        )
+        mean_confidences_per_bin = np.divide(
+            self._sums_per_bin(top_class_bins, self._top_class_confidences),
+            members_per_bin,
+            out=np.zeros(self.bins),
+            where=non_empty_bins,
+        )
         return accuracies_per_bin, members_per_bin, mean_confidences_per_bin
 
     # TODO: the reliabilities are plotted above the centers of bins, not above the mean confidences
@@ -10,16 +10,28 @@ from kyle.util import sample_index
 
 
 class FakeClassifier(ABC):
+    """
+    Base class for fake classifiers, which sample calibrated confidences and distort them with a simplex
+    automorphism
+
+    :param num_classes:
+    :param simplex_automorphism: if None, the identity automorphism will be used
+    :param check_io: if False, the inputs and outputs of the simplex automorphism will not be validated
+        when sampling
+    :param seed: seed for the random generator used for sampling. If None, fresh entropy is used
+    """
+
     def __init__(
         self,
         num_classes: int,
         simplex_automorphism: SimplexAut = None,
         check_io=True,
+        seed: int = None,
     ):
         if num_classes < 1:
             raise ValueError(f"{self.__class__.__name__} requires at least two classes")
         self.num_classes = num_classes
-        self._rng = np.random.default_rng()
+        self._rng = np.random.default_rng(seed)
 
         self._simplex_automorphism: SimplexAut = None
         self.set_simplex_automorphism(simplex_automorphism)
@@ -53,8 +65,10 @@ class FakeClassifier(ABC):
         :return: tuple of arrays of shapes (n_samples,), (n_samples, n_classes)
         """
         calibrated_confidences = self.sample_confidences(n_samples)
-        gt_labels = sample_index(calibrated_confidences)
-        confidences = self.simplex_automorphism.transform(calibrated_confidences)
+        gt_labels = sample_index(calibrated_confidences, rng=self._rng)
+        confidences = self.simplex_automorphism.transform(
+            calibrated_confidences, check_io=self.check_io
+        )
         return gt_labels, confidences
 
     def __str__(self):
@@ -62,13 +76,31 @@ class FakeClassifier(ABC):
 
 
 class DirichletFC(FakeClassifier):
+    """
+    A fake classifier that draws its calibrated confidences from a single Dirichlet distribution
+
+    :param num_classes:
+    :param alpha: numpy array of shape (num_classes,), parameters of the dirichlet. If None, [1, ..., 1] is used
+    :param simplex_automorphism:
+    :param check_io: if False, the inputs and outputs of the simplex automorphism will not be validated
+        when sampling
+    :param seed: seed for the random generator used for sampling. If None, fresh entropy is used
+    """
+
     def __init__(
         self,
         num_classes: int,
         alpha: Sequence[float] = None,
         simplex_automorphism: SimplexAut = None,
+        check_io=True,
+        seed: int = None,
     ):
-        super().__init__(num_classes, simplex_automorphism=simplex_automorphism)
+        super().__init__(
+            num_classes,
+            simplex_automorphism=simplex_automorphism,
+            check_io=check_io,
+            seed=seed,
+        )
 
         self._alpha: np.ndarray = None
         self.set_alpha(alpha)
@@ -146,6 +178,9 @@ class MultiDirichletFC(FakeClassifier):
     :param sigma: numpy array of shape (num_classes,). k'th entry corresponds to sigma for the k'th dirichlet
     :param distribution_weights: numpy array of shape (num_classes,). Probabilities used for drawing from K Categorical
     :param simplex_automorphism:
+    :param check_io: if False, the inputs and outputs of the simplex automorphism will not be validated
+        when sampling
+    :param seed: seed for the random generator used for sampling. If None, fresh entropy is used
     """
 
     def __init__(
@@ -155,8 +190,15 @@ class MultiDirichletFC(FakeClassifier):
         sigma: Sequence[float] = None,
         distribution_weights: Sequence[float] = None,
         simplex_automorphism: SimplexAut = None,
+        check_io=True,
+        seed: int = None,
     ):
-        super().__init__(num_classes, simplex_automorphism=simplex_automorphism)
+        super().__init__(
+            num_classes,
+            simplex_automorphism=simplex_automorphism,
+            check_io=check_io,
+            seed=seed,
+        )
 
         self._alpha: np.ndarray = None
         self._sigma: np.ndarray = None
@@ -224,19 +266,29 @@ class MultiDirichletFC(FakeClassifier):
         self.set_sigma(sigma)
         self.set_distribution_weights(distribution_weights)
 
-    def sample_confidences(self, n_samples: int) -> np.ndarray:
+    def _component_alphas(self, alpha: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+        """
+        :return: array of shape (num_classes, num_classes) whose k'th row is the parameter vector
+            sigma_k * {1, 1, ..., alpha_k, 1, 1, ...} of the k'th dirichlet
+        """
+        component_alphas = np.ones((self.num_classes, self.num_classes))
+        np.fill_diagonal(component_alphas, alpha)
+        return component_alphas * np.asarray(sigma)[:, None]
 
-        weight_array = np.repeat(self.distribution_weights[None, :], n_samples, axis=0)
-        chosen_distributions = sample_index(weight_array)
+    def sample_confidences(self, n_samples: int) -> np.ndarray:
+        chosen_distributions = self._rng.choice(
+            self.num_classes, size=n_samples, p=self.distribution_weights
+        )
 
         confidences = np.zeros((n_samples, self.num_classes))
 
-        for i, chosen_distribution in enumerate(chosen_distributions):
-            alpha_vector = np.ones(self.num_classes)
-            alpha_vector[chosen_distribution] = self.alpha[chosen_distribution]
-            alpha_vector *= self.sigma[chosen_distribution]
-
-            confidences[i, :] = self._rng.dirichlet(alpha_vector)
+        component_alphas = self._component_alphas(self.alpha, self.sigma)
+        # draw the samples of each dirichlet at once instead of one sample per row
+        for k in np.unique(chosen_distributions):
+            k_mask = chosen_distributions == k
+            confidences[k_mask] = self._rng.dirichlet(
+                component_alphas[k], size=k_mask.sum()
+            )
 
         return confidences
 
@@ -261,11 +313,7 @@ class MultiDirichletFC(FakeClassifier):
 
         distributions = np.zeros(confidences.shape)
 
-        for i, (a, s) in enumerate(zip(alpha, sigma)):
-            alpha_vector = np.ones(self.num_classes)
-            alpha_vector[i] = a
-            alpha_vector *= s
-
+        for i, alpha_vector in enumerate(self._component_alphas(alpha, sigma)):
             distributions[i] = scipy.stats.dirichlet.pdf(confidences, alpha_vector)
 
         return np.sum(distribution_weights[:, None] * distributions, axis=0) / np.sum(
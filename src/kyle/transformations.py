@@ -66,6 +66,12 @@ class IdentitySimplexAut(SimplexAut):
     def _transform(self, x: np.ndarray) -> np.ndarray:
         return x
 
+    def transform(self, x: np.ndarray, check_io=True) -> np.ndarray:
+        # the output equals the input, so only the input is checked and no copy is made
+        if check_io and not in_simplex(x, self.num_classes):
+            raise ValueError(f"Input has to be from a simplex of suitable dimension")
+        return x.squeeze()
+
 
 class SingleComponentSimplexAut(SimplexAut):
     """
@@ -39,16 +39,20 @@ def in_simplex(probabilities: np.ndarray, num_classes=None) -> bool:
     )
 
 
-def sample_index(probabilities: np.ndarray) -> Union[int, np.ndarray]:
+def sample_index(
+    probabilities: np.ndarray, rng: np.random.Generator = None
+) -> Union[int, np.ndarray]:
     """
     Sample indices with the input probabilities. This is essentially a vectorized
     version of np.random.choice
 
     :param probabilities: single vector of probabilities of shape (n_indices-1,) or multiple
         vectors as array of shape (n_samples, n_indices-1)
+    :param rng: random generator to draw from. If None, a new default generator will be created
     :return: index or array of indices
     """
-    rng = np.random.default_rng()
+    if rng is None:
+        rng = np.random.default_rng()
     if len(probabilities.shape) == 1:
         return rng.choice(len(probabilities), p=probabilities)
     elif len(probabilities.shape) == 2:
@@ -0,0 +1,69 @@
+import numpy as np
+
+from kyle.evaluation import EvalStats
+
+
+def test_EvalStats_topClassReliabilities():
+    confidences = np.array([[0.9, 0.1], [0.8, 0.2], [0.35, 0.65], [0.6, 0.4]])
+    y_true = np.array([0, 1, 1, 0])
+    eval_stats = EvalStats(y_true, confidences, bins=2)
+    accuracies, members, mean_confidences = eval_stats.top_class_reliabilities()
+    assert np.allclose(members, [0, 4])
+    assert np.allclose(accuracies, [0, 0.75])
+    assert np.allclose(mean_confidences, [0, 0.7375])
+    assert np.isclose(eval_stats.expected_calibration_error(), 0.0125)
+
+
+def test_EvalStats_marginalReliabilities():
+    confidences = np.array([[0.9, 0.1], [0.8, 0.2], [0.35, 0.65], [0.6, 0.4]])
+    y_true = np.array([0, 1, 1, 0])
+    eval_stats = EvalStats(y_true, confidences, bins=2)
+    accuracies, members, mean_confidences = eval_stats.marginal_reliabilities(1)
+    assert np.allclose(members, [3, 1])
+    assert np.allclose(accuracies, [1 / 3, 1])
+    assert np.allclose(mean_confidences, [0.7 / 3, 0.65])
+
+
+def test_EvalStats_confidenceAboveOneBelongsToNoBin():
+    confidences = np.array([[1 + 1e-12, 0], [0.3, 0.7], [0.6, 0.4]])
+    y_true = np.array([0, 1, 0])
+    eval_stats = EvalStats(y_true, confidences, bins=3)
+    accuracies, members, mean_confidences = eval_stats.top_class_reliabilities()
+    assert np.allclose(members, [0, 1, 1])
+    assert np.allclose(accuracies, [0, 1, 1])
+    assert np.allclose(mean_confidences, [0, 0.6, 0.7])
+    assert np.isclose(eval_stats.expected_calibration_error(), 0.35)
+
+
+def test_EvalStats_allMarginalReliabilitiesMatchSingleClass():
+    confidences = np.random.default_rng(42).dirichlet(np.ones(4), size=100)
+    y_true = np.random.default_rng(42).integers(0, 4, size=100)
+    eval_stats = EvalStats(y_true, confidences, bins=5)
+    all_reliabilities = eval_stats._marginal_reliabilities(np.arange(4))
+    for k in range(4):
+        for all_classes_result, single_class_result in zip(
+            all_reliabilities, eval_stats.marginal_reliabilities(k)
+        ):
+            assert np.allclose(all_classes_result[k], single_class_result)
+
+
+def test_EvalStats_marginalCalibrationErrors():
+    confidences = np.array(
+        [[0.7, 0.2, 0.1], [0.2, 0.6, 0.2], [0.1, 0.3, 0.6], [0.6, 0.3, 0.1]]
+    )
+    y_true = np.array([0, 1, 1, 0])
+    eval_stats = EvalStats(y_true, confidences, bins=2)
+    # the expected errors of the single classes are 0.25, 0.15 and 0.25
+    assert np.isclose(eval_stats.class_wise_expected_calibration_error(), 0.65 / 3)
+    assert np.isclose(eval_stats.average_marginal_calibration_error(), 0.65 / 3)
+
+
+def test_EvalStats_marginalCalibrationErrors_confidenceAboveOneBelongsToNoBin():
+    confidences = np.array([[1 + 1e-12, 0, 0], [0.3, 0.4, 0.3], [0.6, 0.2, 0.2]])
+    y_true = np.array([0, 1, 0])
+    eval_stats = EvalStats(y_true, confidences, bins=3)
+    _, class_members, _ = eval_stats.marginal_reliabilities(0)
+    assert np.allclose(class_members, [1, 1, 0])
+    # class 0 has only two binned samples, so it carries less weight in the average
+    assert np.isclose(eval_stats.class_wise_expected_calibration_error(), 47 / 180)
+    assert np.isclose(eval_stats.average_marginal_calibration_error(), 0.25)
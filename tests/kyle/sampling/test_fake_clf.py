@@ -1,4 +1,8 @@
-from kyle.sampling.fake_clf import DirichletFC
+import numpy as np
+import pytest
+
+from kyle.sampling.fake_clf import DirichletFC, MultiDirichletFC
+from kyle.transformations import SimplexAut
 from kyle.util import in_simplex
 
 
@@ -9,3 +13,44 @@ def test_DirichletFC_basics():
     assert class_proba.shape == (10, 3)
     assert ground_truth[0] in [0, 1, 2]
     assert in_simplex(class_proba)
+
+
+class _LeavingSimplexAut(SimplexAut):
+    def _transform(self, x: np.ndarray) -> np.ndarray:
+        return 2 * x
+
+
+def test_DirichletFC_checkIoFalseSkipsValidation():
+    with pytest.raises(ValueError):
+        DirichletFC(3, simplex_automorphism=_LeavingSimplexAut()).get_sample_arrays(10)
+    faker = DirichletFC(3, simplex_automorphism=_LeavingSimplexAut(), check_io=False)
+    _, class_proba = faker.get_sample_arrays(10)
+    assert not in_simplex(class_proba)
+
+
+def test_MultiDirichletFC_basics():
+    faker = MultiDirichletFC(3, alpha=[10, 20, 30])
+    ground_truth, class_proba = faker.get_sample_arrays(100)
+    assert ground_truth.shape == (100,)
+    assert class_proba.shape == (100, 3)
+    assert ground_truth[0] in [0, 1, 2]
+    assert in_simplex(class_proba)
+
+
+def test_MultiDirichletFC_samplesFromChosenDirichlet():
+    for k in range(3):
+        distribution_weights = np.zeros(3)
+        distribution_weights[k] = 1
+        faker = MultiDirichletFC(
+            3, alpha=[100, 100, 100], distribution_weights=distribution_weights, seed=42
+        )
+        confidences = faker.sample_confidences(100)
+        # with a large alpha_k the k'th dirichlet is concentrated in the k'th corner of the simplex
+        assert (confidences.argmax(axis=1) == k).all()
+
+
+def test_DirichletFC_seedMakesSamplingReproducible():
+    first_labels, first_proba = DirichletFC(3, seed=42).get_sample_arrays(10)
+    second_labels, second_proba = DirichletFC(3, seed=42).get_sample_arrays(10)
+    assert (first_labels == second_labels).all()
+    assert (first_proba == second_proba).all()
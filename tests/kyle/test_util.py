@@ -1,6 +1,6 @@
 import numpy as np
 
-from kyle.util import in_simplex
+from kyle.util import in_simplex, sample_index
 
 
 def test_in_simplex_negativeEntriesForbidden():
@@ -35,3 +35,11 @@ def test_in_simplex_correct2DInputIsCorrect():
     x = x / row_sums[:, np.newaxis]
     assert in_simplex(x)
     assert in_simplex(x, num_classes=3)
+
+
+def test_sample_index_reproducibleWithRng():
+    probabilities = np.array([[0.2, 0.8], [1.0, 0.0], [0.0, 1.0]])
+    first_draw = sample_index(probabilities, rng=np.random.default_rng(42))
+    second_draw = sample_index(probabilities, rng=np.random.default_rng(42))
+    assert (first_draw == second_draw).all()
+    assert first_draw[1] == 0 and first_draw[2] == 1